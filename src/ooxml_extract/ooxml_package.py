@@ -2,12 +2,17 @@ from pathlib import Path
 import click
 import zipfile
 import shutil
-from typing import Set
-from .xml_formatter import prettify_xml_file, minify_xml_file_to_bytes
+import time
+from typing import Callable, Iterator, Set
+from .xml_formatter import prettify_xml_file, iter_minified_xml_file, STREAM_CHUNK_SIZE
 from .ooxml_vba import export_vba_project, import_vba_project
 from .utils import get_unique_folder_name
 
 
+# Ab dieser Gesamtgröße der Quelldateien wird ein Fortschrittsbalken angezeigt
+PROGRESS_THRESHOLD = 64 << 20
+
+
 def prettify_xml_files(directory: Path, extensions: Set[str] = None) -> tuple[int, int]:
     """
     Formatiert alle XML-Dateien in einem Verzeichnis rekursiv.
@@ -94,10 +99,54 @@ def extract_ooxml(file_path: Path, target_dir: Path, overwrite: bool, prettify:
         raise click.ClickException(f"Fehler beim Entpacken: {e}")
 
 
+def iter_file_chunks(
+    file_path: Path,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    on_read: Callable[[int], None] = None,
+) -> Iterator[bytes]:
+    """
+    Liest eine Datei blockweise ein.
+    
+    Args:
+        file_path: Pfad zur Datei
+        chunk_size: Anzahl Bytes pro Block
+        on_read: Optionaler Callback, erhält die Anzahl gelesener Bytes je Block
+    
+    Yields:
+        Dateiinhalt als Bytes-Blöcke
+    """
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            if on_read is not None:
+                on_read(len(chunk))
+            yield chunk
+
+
+def write_zip_entry(zipf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, source_size: int, chunks: Iterator[bytes]) -> None:
+    """
+    Schreibt einen Eintrag blockweise ins ZIP-Archiv, ohne ihn komplett im Speicher zu halten.
+    Da die endgültige Größe vorab nicht bekannt ist, wird Zip64 anhand der Quelldatei erzwungen.
+    
+    Args:
+        zipf: Zum Schreiben geöffnetes ZIP-Archiv
+        zinfo: Metadaten des Eintrags (Name, Zeitstempel, Rechte)
+        source_size: Größe der Quelldatei in Bytes
+        chunks: Inhalt des Eintrags als Bytes-Blöcke
+    """
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    # Gleiche Reserve wie zipfile für nicht komprimierbare Daten
+    force_zip64 = source_size * 1.05 > zipfile.ZIP64_LIMIT
+
+    with zipf.open(zinfo, 'w', force_zip64=force_zip64) as dest:
+        for chunk in chunks:
+            dest.write(chunk)
+
+
 def pack_ooxml(source_dir: Path, target_file: Path, overwrite: bool) -> Path:
     """
     Packt einen Ordner zu einer OOXML-Datei.
     XML-Dateien werden automatisch minimiert.
+    Alle Dateien werden blockweise geschrieben, der Speicherbedarf ist unabhängig von der Dateigröße.
     
     Args:
         source_dir: Quellordner mit entpackten OOXML-Dateien
@@ -126,35 +175,45 @@ def pack_ooxml(source_dir: Path, target_file: Path, overwrite: bool) -> Path:
     # XML-Endungen die minimiert werden sollen
     xml_extensions = {'.xml', '.rels', '.vml'}
     
+    # VBA-Projekt wurde nur zum lesen extrahiert und darf nicht ins OOXML-Archiv
+    files = [
+        file_path for file_path in sorted(source_dir.rglob('*'))
+        if file_path.is_file() and file_path.parent.name != 'vbaProject'
+    ]
+    total_size = sum(file_path.stat().st_size for file_path in files)
+    
     xml_count = 0
     file_count = 0
     
     try:
-        with zipfile.ZipFile(target_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Alle Dateien rekursiv durchgehen
-            for file_path in sorted(source_dir.rglob('*')):
-                if file_path.is_file():
-                    # VBA-Projekt wurde nur zum lesen extrahiert und darf nicht ins OOXML-Archiv
-                    if file_path.parent.name == 'vbaProject':
-                        continue
-
-                    #TODO: Update vbaProject.bin without Visio Application
-                    #if file_path.name == 'vbaProject.bin':
-                    #    click.echo("Aktualisiere vbaProject.bin... ACHTUNG: Das funktioniert nicht!")
-                    #    update_vba_project_bin(file_path, file_path.parent.parent / 'vbaProject')
+        with zipfile.ZipFile(target_file, 'w', zipfile.ZIP_DEFLATED) as zipf, click.progressbar(
+            length=total_size,
+            label="Packe Dateien",
+            hidden=total_size < PROGRESS_THRESHOLD,
+        ) as progress:
+            for file_path in files:
+                #TODO: Update vbaProject.bin without Visio Application
+                #if file_path.name == 'vbaProject.bin':
+                #    click.echo("Aktualisiere vbaProject.bin... ACHTUNG: Das funktioniert nicht!")
+                #    update_vba_project_bin(file_path, file_path.parent.parent / 'vbaProject')
 
-                    # Relativer Pfad im ZIP
-                    arcname = file_path.relative_to(source_dir)
-                    # XML-Dateien minimieren
-                    if file_path.suffix.lower() in xml_extensions:
-                        xml_data = minify_xml_file_to_bytes(file_path)
-                        zipf.writestr(str(arcname), xml_data)
-                        xml_count += 1
-                    else:
-                        # Andere Dateien direkt hinzufügen
-                        zipf.write(file_path, arcname)
-                    
-                    file_count += 1
+                # Relativer Pfad im ZIP
+                arcname = file_path.relative_to(source_dir).as_posix()
+                # XML-Dateien minimieren
+                if file_path.suffix.lower() in xml_extensions:
+                    # Wie bei writestr: Zeitstempel des Packens, Rechte 0o600
+                    zinfo = zipfile.ZipInfo(arcname, time.localtime(time.time())[:6])
+                    zinfo.external_attr = 0o600 << 16
+                    chunks = iter_minified_xml_file(file_path, on_read=progress.update)
+                    xml_count += 1
+                else:
+                    # Andere Dateien direkt hinzufügen
+                    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                    chunks = iter_file_chunks(file_path, on_read=progress.update)
+                
+                write_zip_entry(zipf, zinfo, file_path.stat().st_size, chunks)
+                
+                file_count += 1
         
         success = import_vba_project(target_file, source_dir / 'vbaProject')
 
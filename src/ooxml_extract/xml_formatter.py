@@ -1,5 +1,12 @@
+import codecs
+import io
 import re
 from pathlib import Path
+from typing import Callable, Iterator
+
+
+# Anzahl Bytes, die beim blockweisen Verarbeiten pro Block gelesen werden
+STREAM_CHUNK_SIZE = 1 << 20
 
 
 def prettify_xml(xml_str: str, indent: str = "  ") -> str:
@@ -79,6 +86,81 @@ def minify_xml(pretty_xml_str: str) -> str:
     return declaration + '\n' + minified_body
 
 
+def iter_minified_xml_file(
+    file_path: Path,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    on_read: Callable[[int], None] = None,
+) -> Iterator[bytes]:
+    """
+    Liest eine XML-Datei blockweise, minifiziert sie und liefert das Ergebnis
+    stückweise als Bytes. Das Ergebnis ist identisch zu minify_xml(), der
+    Speicherbedarf hängt aber nur von chunk_size ab, nicht von der Dateigröße.
+    
+    Args:
+        file_path: Pfad zur XML-Datei
+        chunk_size: Anzahl Bytes, die pro Block gelesen werden
+        on_read: Optionaler Callback, erhält die Anzahl gelesener Bytes je Block
+        
+    Yields:
+        Minifiziertes XML als Bytes-Blöcke
+    """
+    # Dekodiert wie open(..., 'r', encoding='utf-8') inkl. Zeilenende-Übersetzung
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+
+    with open(file_path, 'rb') as f:
+        def read() -> str:
+            # Liefert den nächsten dekodierten Block, leerer String bedeutet Dateiende
+            while True:
+                raw = f.read(chunk_size)
+                if raw and on_read is not None:
+                    on_read(len(raw))
+                text = decoder.decode(raw, final=not raw)
+                if text or not raw:
+                    return text
+
+        # Anfang einlesen, bis die XML-Deklaration vollständig vorliegt
+        head = read()
+        while head.startswith('<?xml '[:len(head)]):
+            question_mark = head.find('?', 2)
+            if question_mark != -1 and question_mark < len(head) - 1:
+                break
+            more = read()
+            if not more:
+                break
+            head += more
+
+        match = re.match(r'<\?xml [^?]+\?>\s*', head)
+        if match:
+            declaration = match.group(0).strip()
+            head = head[match.end():]
+        else:
+            declaration = ""
+
+        yield (declaration + '\n').encode('utf-8')
+
+        # Führende Leerzeichen des Bodys überspringen
+        carry = head.lstrip()
+        while not carry:
+            chunk = read()
+            if not chunk:
+                return
+            carry = chunk.lstrip()
+
+        # Das letzte Nicht-Leerzeichen und folgende Leerzeichen werden
+        # zurückgehalten, damit '>\s+<' auch über Blockgrenzen erkannt wird
+        while True:
+            chunk = read()
+            if not chunk:
+                break
+            text = carry + chunk
+            body = text.rstrip()
+            minified = re.sub(r'>\s+<', '><', body)
+            yield minified[:-1].encode('utf-8')
+            carry = text[len(body) - 1:]
+
+        yield re.sub(r'>\s+<', '><', carry.rstrip()).encode('utf-8')
+
+
 def minify_xml_file_to_bytes(file_path: Path) -> bytes:
     """
     Liest eine XML-Datei, minifiziert sie und gibt das Ergebnis als Bytes zurück.
@@ -89,12 +171,4 @@ def minify_xml_file_to_bytes(file_path: Path) -> bytes:
     Returns:
         Minifiziertes XML als Bytes
     """
-    # XML-Datei einlesen
-    with open(file_path, 'r', encoding='utf-8') as f:
-        pretty_xml_str = f.read()
-    
-    # XML minifizieren
-    minified_xml = minify_xml(pretty_xml_str)
-    
-    # In Bytes konvertieren und zurückgeben
-    return minified_xml.encode('utf-8')
+    return b''.join(iter_minified_xml_file(file_path))